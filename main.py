@@ -1,12 +1,15 @@
 import time
 import logging
+import logging.handlers
 import re
 import threading
+import queue
 import asyncio
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
-from contextlib import asynccontextmanager
+import urllib3
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import asynccontextmanager, contextmanager
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -14,40 +17,152 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (
+    TimeoutException,
+    NoSuchElementException,
+    InvalidSessionIdException,
+    StaleElementReferenceException,
+    JavascriptException,
+    WebDriverException
+)
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 import uvicorn
+from cachetools import TLRUCache
+from diskcache import Cache
 from webdriver_manager.chrome import ChromeDriverManager
 
+_REPORT_NUM_RE = re.compile(r'\d{8,}')
+_FACTORY_RE = re.compile(r'\((.*?)\)')
+
+# 요소 조회와 텍스트 추출을 한 번의 왕복으로 처리하기 위한 스크립트
+# 빈 문자열도 찾은 것으로 취급하도록 결과를 배열로 감싸 반환
+_READ_TEXT_JS = '''
+const el = document.querySelector(arguments[0]);
+return el ? [el.innerText.trim()] : null;
+'''
+_READ_PRODUCT_CARD_JS = '''
+const card = arguments[0];
+const text = (selector) => {
+    const el = card.querySelector(selector);
+    return el ? el.innerText.trim() : null;
+};
+const image = card.querySelector(arguments[3]);
+return {
+    product_name: text(arguments[1]),
+    manufacturer: text(arguments[2]),
+    image: image ? image.src : null
+};
+'''
+
 class ScraperConfig:
     WAIT_TIME = 10
-    LOAD_WAIT = 2
+    POLL_FREQUENCY = 0.1
+    IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
     MAX_WORKERS = 3
+    DRIVER_MAX_USES = 200
     PORT = 8005
+    LOG_FILE = 'barcode_scraper.log'
+    LOG_MAX_BYTES = 50 * 1024 * 1024
+    LOG_BACKUP_COUNT = 5
+    CACHE_MAX_SIZE = 10_000
+    CACHE_TTL = 86400
+    CACHE_DIR = '/var/cache/sangle'
 
     URLS = {
         'koreannet': 'https://www.koreannet.or.kr/front/allproduct/prodSrchList.do',
         'food_safety': 'https://www.foodsafetykorea.go.kr/portal/specialinfo/searchInfoProduct.do?menu_grp=MENU_NEW04&menu_no=2815'
     }
 
-    XPATHS = {
+    # 스크래핑에 필요 없는 분석/광고/폰트 요청은 네트워크 단계에서 차단
+    BLOCKED_URLS = [
+        '*google-analytics.com*',
+        '*googletagmanager*',
+        '*fonts.googleapis*',
+        '*fonts.gstatic*',
+        '*doubleclick*',
+        '*.woff',
+        '*.woff2',
+        '*.ttf'
+    ]
+
+    SELECTORS = {
         'koreannet': {
-            'product_link': '//*[@id="listForm"]/div/div/ul/li/div/div[2]/div/a/div[2]',
-            'product_name': '//*[@id="listForm"]/div/div/ul/li/div/div[2]/div/a/div[2]',
-            'manufacturer': '//*[@id="listForm"]/div/div/ul/li/div/div[2]/div/div',
-            'image': '//*[@id="listForm"]/div/div/ul/li/div/div[1]/a/img',
-            'report_number': '/html/body/div[2]/form/div/div/div[3]/div[2]/div[4]/div[4]/div[2]'
+            'search_box': '#searchText',
+            'search_button': '.submit',
+            'product_card': '#listForm > div > div > ul > li',
+            # 아래 항목은 product_card 기준 상대 경로
+            'product_link': ':scope > div > div:nth-of-type(2) > div > a > div:nth-of-type(2)',
+            'product_name': ':scope > div > div:nth-of-type(2) > div > a > div:nth-of-type(2)',
+            'manufacturer': ':scope > div > div:nth-of-type(2) > div > div',
+            'image': ':scope > div > div:nth-of-type(1) > a > img',
+            'report_number': (
+                'body > div:nth-of-type(2) > form > div > div > div:nth-of-type(3)'
+                ' > div:nth-of-type(2) > div:nth-of-type(4) > div:nth-of-type(4) > div:nth-of-type(2)'
+            )
         },
         'food_safety': {
-            'search_box': '//*[@id="prdlst_report_no1"]',
-            'search_button': '//*[@id="srchBtn"]',
-            'loading': '/html/body/div[1]',
-            'expiry_info': '//*[@id="tbody"]/tr/td[5]/span[2]'
+            'search_box': '#prdlst_report_no1',
+            'search_button': '#srchBtn',
+            'loading': 'body > div:nth-of-type(1)',
+            'expiry_info': '#tbody > tr > td:nth-of-type(5) > span:nth-of-type(2)'
         }
     }
 
+class BarcodeRequest(BaseModel):
+    barcodes: List[str]
+
+class ProductInfo(BaseModel):
+    품목보고번호: str
+    제품명: str
+    카테고리: str
+    이미지URL: Optional[str]
+    바코드: str
+    소비기한: str
+
+class BarcodeResponse(BaseModel):
+    barcode: str
+    success: bool
+    product_info: Optional[ProductInfo] = None
+    message: Optional[str] = None
+    # scraper = None  # 이 줄을 삭제하세요
+
+def setup_logging() -> logging.handlers.QueueListener:
+    # 요청 스레드는 큐에만 기록하고 파일/콘솔 출력은 리스너 스레드가 담당
+    log_queue = queue.Queue(-1)
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
+    )
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        ScraperConfig.LOG_FILE,
+        maxBytes=ScraperConfig.LOG_MAX_BYTES,
+        backupCount=ScraperConfig.LOG_BACKUP_COUNT,
+        delay=True
+    )
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    # 기존 핸들러(암묵적 basicConfig, 이전 lifespan의 QueueHandler 등)를 대체하여 중복 출력 방지
+    previous_handlers = root_logger.handlers[:]
+    root_logger.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    for handler in previous_handlers:
+        handler.close()
+
+    listener = logging.handlers.QueueListener(
+        log_queue,
+        file_handler,
+        stream_handler,
+        respect_handler_level=True
+    )
+    listener.start()
+    return listener
+
 class RetryHandler:
     def __init__(self, max_retries: int = 3, delay: float = 1.0):
         self.max_retries = max_retries
@@ -61,7 +176,7 @@ class RetryHandler:
             except Exception as e:
                 if attempt == self.max_retries - 1:
                     raise
-                self.logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
+                self.logger.warning("Attempt %d failed: %s", attempt + 1, e)
                 await asyncio.sleep(self.delay * (attempt + 1))
 
     def retry_sync(self, func, *args, **kwargs):
@@ -71,36 +186,204 @@ class RetryHandler:
             except Exception as e:
                 if attempt == self.max_retries - 1:
                     raise
-                self.logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
+                self.logger.warning("Attempt %d failed: %s", attempt + 1, e)
                 time.sleep(self.delay * (attempt + 1))
 
+class WebDriverPool:
+    def __init__(self, driver_factory, size: int, max_uses: int):
+        self.driver_factory = driver_factory
+        self.size = size
+        self.max_uses = max_uses
+        self.logger = logging.getLogger(__name__)
+        self._pool = queue.Queue(maxsize=size)
+        self._uses = {}
+        self._uses_lock = threading.Lock()
+        # 드라이버 교체(Chrome 재시작)는 요청 스레드가 아닌 별도 스레드에서 수행
+        self._replacer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='driver-replace')
+
+        # 첫 요청 지연을 없애기 위해 드라이버를 병렬로 미리 띄워 둠
+        with ThreadPoolExecutor(max_workers=size) as launcher:
+            futures = [launcher.submit(self.driver_factory) for _ in range(size)]
+
+        failures = [future.exception() for future in futures if future.exception()]
+        drivers = [future.result() for future in futures if not future.exception()]
+        if failures:
+            # 일부만 생성된 경우 Chrome 프로세스가 남지 않도록 생성된 드라이버를 종료
+            for driver in drivers:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+            raise failures[0]
+
+        for driver in drivers:
+            self._put(driver)
+        self.logger.info("WebDriver 풀 생성 완료 - 드라이버 수: %d", size)
+
+    @contextmanager
+    def acquire(self):
+        driver = self._get()
+        healthy = True
+        try:
+            yield driver
+        except InvalidSessionIdException:
+            self.logger.warning("유효하지 않은 드라이버 세션 감지 - 새 드라이버로 교체")
+            healthy = False
+            raise
+        finally:
+            self._release(driver, healthy)
+
+    @contextmanager
+    def acquire_idle(self, max_count: int):
+        # 대기 없이 지금 놀고 있는 드라이버만 빌려 이미 드라이버를 쥔 작업끼리 교착되지 않도록 함
+        drivers = []
+        while len(drivers) < max_count:
+            try:
+                drivers.append(self._get(block=False))
+            except queue.Empty:
+                break
+        try:
+            yield drivers
+        finally:
+            for driver in drivers:
+                self._release(driver)
+
+    def _get(self, block: bool = True):
+        driver = self._pool.get(block=block)
+        with self._uses_lock:
+            self._uses[driver] += 1
+        return driver
+
+    def _put(self, driver):
+        with self._uses_lock:
+            self._uses.setdefault(driver, 0)
+        self._pool.put(driver)
+
+    def _release(self, driver, healthy: bool = True):
+        with self._uses_lock:
+            uses = self._uses.get(driver, 0)
+        if healthy and uses > self.max_uses:
+            # 장시간 사용으로 누적된 메모리/GC 상태를 정리하기 위해 주기적으로 교체
+            self.logger.info("드라이버 사용 횟수 %d회 초과 - 새 드라이버로 교체", uses)
+            healthy = False
+        elif healthy:
+            # 쿠키 삭제가 상태 확인을 겸하므로 실패한 드라이버는 교체
+            try:
+                driver.delete_all_cookies()
+            except WebDriverException as e:
+                self.logger.warning("드라이버 상태 확인 실패 - 새 드라이버로 교체: %s", e)
+                healthy = False
+
+        if healthy:
+            self._put(driver)
+        else:
+            self._replacer.submit(self._replace, driver)
+
+    def _replace(self, driver):
+        # 기존 드라이버를 먼저 종료하여 풀 크기보다 많은 Chrome이 동시에 뜨지 않도록 함
+        with self._uses_lock:
+            self._uses.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        try:
+            new_driver = self.driver_factory()
+        except Exception as e:
+            # 교체 실패 시 기존 드라이버를 되돌려 풀 크기를 유지하고, 다음 사용 시 세션 오류로 다시 교체
+            self.logger.error("드라이버 교체 실패: %s", e)
+            new_driver = driver
+        self._put(new_driver)
+
+    def close(self):
+        self._replacer.shutdown(wait=True)
+        while True:
+            try:
+                driver = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                driver.quit()
+                self.logger.info('Chrome 드라이버 종료 성공')
+            except Exception as e:
+                self.logger.error('Chrome 드라이버 종료 중 오류 발생: %s', e, exc_info=True)
+
 class BarcodeInfoScraper:
     def __init__(self):
         self.config = ScraperConfig()
         self.retry_handler = RetryHandler()
-        self.setup_logging()
+        self.logger = logging.getLogger(__name__)
         self.logger.info("BarcodeInfoScraper 초기화 시작")
-        self.driver = self.setup_driver()
-        self.cache = {}
-        self.cache_lock = threading.Lock()
+        self.chromedriver_path = self.install_chromedriver()
+        self.pool = WebDriverPool(
+            self.setup_driver,
+            self.config.MAX_WORKERS,
+            self.config.DRIVER_MAX_USES
+        )
+        self.report_executor = ThreadPoolExecutor(
+            max_workers=self.config.MAX_WORKERS,
+            thread_name_prefix='report'
+        )
+        # (결과, 만료 시각) 쌍을 저장하여 디스크에서 올린 항목도 남은 만료 시간을 그대로 유지
+        self.cache = TLRUCache(
+            maxsize=self.config.CACHE_MAX_SIZE,
+            ttu=lambda _key, entry, _now: entry[1],
+            timer=time.time
+        )
+        self.cache_lock = threading.RLock()
+        self.disk_cache = self.setup_disk_cache()
         self.logger.info("BarcodeInfoScraper 초기화 완료")
 
-    def setup_logging(self):
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
-            handlers=[
-                logging.FileHandler('barcode_scraper.log'),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
+    def setup_disk_cache(self) -> Optional[Cache]:
+        try:
+            disk_cache = Cache(self.config.CACHE_DIR)
+            self.logger.info("디스크 캐시 사용: %s", self.config.CACHE_DIR)
+            return disk_cache
+        except Exception as e:
+            self.logger.warning("디스크 캐시 초기화 실패, 메모리 캐시만 사용: %s", e)
+            return None
+
+    def get_cached(self, barcode: str) -> Optional[BarcodeResponse]:
+        with self.cache_lock:
+            entry = self.cache.get(barcode)
+        if entry is not None:
+            return entry[0]
+
+        if self.disk_cache is None:
+            return None
+        try:
+            content, expire_time = self.disk_cache.get(barcode, expire_time=True)
+            if content is None:
+                return None
+            result = BarcodeResponse.model_validate(content)
+        except Exception as e:
+            self.logger.warning("디스크 캐시 조회 실패: %s", e)
+            return None
+        if expire_time is not None:
+            with self.cache_lock:
+                self.cache[barcode] = (result, expire_time)
+        return result
+
+    def set_cached(self, barcode: str, result: BarcodeResponse):
+        with self.cache_lock:
+            self.cache[barcode] = (result, time.time() + self.config.CACHE_TTL)
+        if self.disk_cache is None:
+            return
+        try:
+            # 모델 클래스에 묶이지 않도록 디스크에는 dict로 저장
+            self.disk_cache.set(barcode, result.model_dump(), expire=self.config.CACHE_TTL)
+        except Exception as e:
+            self.logger.warning("디스크 캐시 저장 실패: %s", e)
+
+    def install_chromedriver(self) -> str:
+        # 풀 드라이버를 병렬로 생성할 때 설치가 겹치지 않도록 한 번만 설치
+        self.logger.info("Chrome 드라이버 자동 설치 시작")
+        return ChromeDriverManager().install()
 
     def setup_driver(self) -> webdriver.Chrome:
-        self.logger.info("Chrome 드라이버 자동 설치 및 설정 시작")
+        self.logger.info("Chrome 드라이버 설정 시작")
         try:
-            # Chrome 드라이버 자동 설치
-            chrome_service = Service(ChromeDriverManager().install())
+            chrome_service = Service(self.chromedriver_path)
 
             # Chrome 옵션 설정
             chrome_options = Options()
@@ -109,50 +392,123 @@ class BarcodeInfoScraper:
             chrome_options.add_argument('--no-sandbox')
             chrome_options.add_argument('--disable-dev-shm-usage')
             chrome_options.add_argument('--window-size=1920,1080')
+            # DOMContentLoaded 시점에 반환하고 필요한 요소는 명시적 대기로 동기화
+            chrome_options.page_load_strategy = 'eager'
+            # 이미지 URL은 src 속성으로만 읽으므로 이미지 다운로드는 차단
+            chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+            chrome_options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2
+            })
 
             # Chrome 드라이버 생성
             driver = webdriver.Chrome(service=chrome_service, options=chrome_options)
 
+            # 기본 PoolManager(maxsize=1)는 연결을 버리고 다시 열기 때문에 풀 크기를 늘림
+            command_executor = driver.command_executor
+            command_executor._conn = urllib3.PoolManager(
+                maxsize=self.config.MAX_WORKERS * 4,
+                timeout=command_executor._conn.connection_pool_kw.get('timeout')
+            )
+
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.config.BLOCKED_URLS})
+
             self.logger.info("Chrome 드라이버 생성 성공")
             return driver
 
         except Exception as e:
-            self.logger.error(f"Chrome 드라이버 생성 실패: {str(e)}", exc_info=True)
+            self.logger.error("Chrome 드라이버 생성 실패: %s", e, exc_info=True)
             raise
 
-    def find_element_safely(self, by: By, value: str, timeout: int = None) -> Optional[Any]:
+    def find_element_safely(
+        self,
+        driver: webdriver.Chrome,
+        value: str,
+        by: By = By.CSS_SELECTOR,
+        timeout: int = None
+    ) -> Optional[Any]:
         timeout = timeout or self.config.WAIT_TIME
         try:
-            element = WebDriverWait(self.driver, timeout).until(
+            element = WebDriverWait(
+                driver,
+                timeout,
+                poll_frequency=self.config.POLL_FREQUENCY,
+                ignored_exceptions=self.config.IGNORED_EXCEPTIONS
+            ).until(
                 EC.presence_of_element_located((by, value))
             )
             return element
         except (TimeoutException, NoSuchElementException):
             return None
 
+    def read_text_safely(self, driver: webdriver.Chrome, selector: str, timeout: int = None) -> Optional[str]:
+        timeout = timeout or self.config.WAIT_TIME
+        try:
+            result = WebDriverWait(
+                driver,
+                timeout,
+                poll_frequency=self.config.POLL_FREQUENCY,
+                # 페이지 전환 중 문서가 교체되며 발생하는 스크립트 오류는 다음 폴링에서 재시도
+                ignored_exceptions=self.config.IGNORED_EXCEPTIONS + (JavascriptException,)
+            ).until(lambda d: d.execute_script(_READ_TEXT_JS, selector))
+            return result[0]
+        except TimeoutException:
+            return None
+
+    def find_child_element(self, container: Any, value: str, by: By = By.CSS_SELECTOR) -> Optional[Any]:
+        # 이미 찾은 요소 하위만 조회하므로 대기 없이 한 번만 확인
+        try:
+            return container.find_element(by, value)
+        except NoSuchElementException:
+            return None
+
+    def wait_for_page_change(self, driver: webdriver.Chrome, element: Any, timeout: int = None) -> bool:
+        # 이전 페이지의 요소가 DOM에서 분리될 때까지 대기하여 갱신 전 결과를 읽지 않도록 함
+        timeout = timeout or self.config.WAIT_TIME
+        try:
+            WebDriverWait(
+                driver,
+                timeout,
+                poll_frequency=self.config.POLL_FREQUENCY
+            ).until(EC.staleness_of(element))
+            return True
+        except TimeoutException:
+            return False
+
     def extract_report_numbers(self, text: str) -> List[str]:
-        self.logger.debug(f"품목보고번호 추출 시작 - 원본 텍스트: {text}")
-        numbers = re.findall(r'\d{8,}', text)
-        self.logger.debug(f"추출된 품목보고번호: {numbers}")
+        self.logger.debug("품목보고번호 추출 시작 - 원본 텍스트: %s", text)
+        numbers = _REPORT_NUM_RE.findall(text)
+        self.logger.debug("추출된 품목보고번호: %s", numbers)
         return numbers
 
-    def get_food_safety_info(self, report_numbers: List[str]) -> Dict[str, Any]:
-        self.logger.info(f"식품안전나라 정보 조회 시작 - 품목보고번호: {report_numbers}")
+    def get_food_safety_info(self, driver: webdriver.Chrome, report_numbers: List[str]) -> Dict[str, Any]:
+        self.logger.info("식품안전나라 정보 조회 시작 - 품목보고번호: %s", report_numbers)
 
         if isinstance(report_numbers, str):
             report_numbers = [report_numbers]
 
-        results = []
-        for report_number in report_numbers:
-            try:
-                result = self.retry_handler.retry_sync(
-                    self._process_single_report_number,
-                    report_number
+        results = [None] * len(report_numbers)
+        with self.pool.acquire_idle(len(report_numbers) - 1) as idle_drivers:
+            # 현재 드라이버와 유휴 드라이버에 품목보고번호를 나눠 동시에 조회
+            drivers = [driver] + idle_drivers
+            groups = [list(range(i, len(report_numbers), len(drivers))) for i in range(len(drivers))]
+            futures = [
+                self.report_executor.submit(
+                    self._process_report_number_group,
+                    group_driver,
+                    report_numbers,
+                    group,
+                    results
                 )
-                results.append(result)
-            except Exception as e:
-                self.logger.error(f"품목보고번호 {report_number} 처리 실패: {str(e)}")
-                results.append(f"조회 실패 ({str(e)})")
+                for group_driver, group in zip(idle_drivers, groups[1:])
+            ]
+            try:
+                self._process_report_number_group(driver, report_numbers, groups[0], results)
+            finally:
+                # 빌린 드라이버를 반납하기 전에 모든 조회가 끝나도록 보장
+                wait(futures)
+            for future in futures:
+                future.result()
 
         if results:
             return {
@@ -164,22 +520,68 @@ class BarcodeInfoScraper:
             'message': '모든 품목보고번호 조회 실패'
         }
 
-    def _process_single_report_number(self, report_number: str) -> str:
-        self.driver.get(self.config.URLS['food_safety'])
+    def _process_report_number_group(
+        self,
+        driver: webdriver.Chrome,
+        report_numbers: List[str],
+        indexes: List[int],
+        results: List[Optional[str]]
+    ):
+        for index in indexes:
+            report_number = report_numbers[index]
+            try:
+                results[index] = self.retry_handler.retry_sync(
+                    self._process_single_report_number,
+                    driver,
+                    report_number
+                )
+            except Exception as e:
+                self.logger.error("품목보고번호 %s 처리 실패: %s", report_number, e)
+                results[index] = f"조회 실패 ({str(e)})"
+
+    def _find_food_safety_search_box(self, driver: webdriver.Chrome) -> Any:
+        # 검색창과 버튼은 검색 후에도 유지되므로 포털이 아직 열려 있지 않을 때만 로드
+        # 품목보고번호별 재시도 안에서 호출되므로 로드 실패는 해당 번호의 실패로 처리됨
+        portal_url = self.config.URLS['food_safety']
+        if driver.current_url.split('?')[0] != portal_url.split('?')[0]:
+            driver.get(portal_url)
 
         search_box = self.find_element_safely(
-            By.XPATH,
-            self.config.XPATHS['food_safety']['search_box']
+            driver,
+            self.config.SELECTORS['food_safety']['search_box']
         )
+        if not search_box:
+            # 이전 검색으로 페이지가 깨진 경우 한 번 다시 로드
+            driver.get(self.config.URLS['food_safety'])
+            search_box = self.find_element_safely(
+                driver,
+                self.config.SELECTORS['food_safety']['search_box']
+            )
         if not search_box:
             raise Exception("검색창을 찾을 수 없음")
+        return search_box
 
-        search_box.clear()
-        search_box.send_keys(report_number)
+    def _process_single_report_number(self, driver: webdriver.Chrome, report_number: str) -> str:
+        factory_match = _FACTORY_RE.search(report_number)
+
+        search_box = self._find_food_safety_search_box(driver)
+        try:
+            search_box.clear()
+            search_box.send_keys(report_number)
+        except StaleElementReferenceException:
+            search_box = self._find_food_safety_search_box(driver)
+            search_box.clear()
+            search_box.send_keys(report_number)
+
+        # 이전 검색 결과를 새 결과로 오인하지 않도록 기존 결과 요소를 기억
+        previous_results = driver.find_elements(
+            By.CSS_SELECTOR,
+            self.config.SELECTORS['food_safety']['expiry_info']
+        )
 
         search_button = self.find_element_safely(
-            By.XPATH,
-            self.config.XPATHS['food_safety']['search_button']
+            driver,
+            self.config.SELECTORS['food_safety']['search_button']
         )
         if search_button:
             search_button.click()
@@ -187,113 +589,143 @@ class BarcodeInfoScraper:
         # 로딩 대기 처리
         try:
             loading = self.find_element_safely(
-                By.XPATH,
-                self.config.XPATHS['food_safety']['loading'],
+                driver,
+                self.config.SELECTORS['food_safety']['loading'],
                 timeout=3
             )
             if loading:
-                WebDriverWait(self.driver, 10).until(
+                WebDriverWait(
+                    driver,
+                    10,
+                    poll_frequency=self.config.POLL_FREQUENCY,
+                    ignored_exceptions=self.config.IGNORED_EXCEPTIONS
+                ).until(
                     EC.invisibility_of_element_located((
-                        By.XPATH,
-                        self.config.XPATHS['food_safety']['loading']
+                        By.CSS_SELECTOR,
+                        self.config.SELECTORS['food_safety']['loading']
                     ))
                 )
         except TimeoutException:
             self.logger.debug("로딩 화면이 감지되지 않음")
 
-        expiry_info = self.find_element_safely(
-            By.XPATH,
-            self.config.XPATHS['food_safety']['expiry_info']
-        )
+        if previous_results and not self.wait_for_page_change(driver, previous_results[0], timeout=3):
+            # 이전 결과가 그대로 남아 있으면 다른 번호의 정보를 읽게 되므로 페이지를 초기화하고 재시도
+            driver.get(self.config.URLS['food_safety'])
+            raise Exception("검색 결과가 갱신되지 않음")
 
-        if expiry_info:
-            info_text = expiry_info.text.strip()
-            if '(' in report_number:
-                factory = re.search(r'\((.*?)\)', report_number).group(1)
-                return f"{factory}: {info_text}"
-            return info_text
+        expiry_info = self.read_text_safely(
+            driver,
+            self.config.SELECTORS['food_safety']['expiry_info']
+        )
 
-        if '(' in report_number:
-            factory = re.search(r'\((.*?)\)', report_number).group(1)
-            return f"{factory}: 정보 없음"
-        return "정보 없음"
+        info_text = expiry_info if expiry_info is not None else "정보 없음"
+        if factory_match:
+            return f"{factory_match.group(1)}: {info_text}"
+        return info_text
 
-    def get_product_info(self, barcode: str) -> Dict[str, Any]:
-        self.logger.info(f"바코드 {barcode} 정보 조회 프로세스 시작")
+    def get_product_info(self, barcode: str) -> BarcodeResponse:
+        self.logger.info("바코드 %s 정보 조회 프로세스 시작", barcode)
         start_time = time.time()
 
-        with self.cache_lock:
-            if barcode in self.cache:
-                self.logger.info(f"바코드 {barcode} 캐시에서 조회 성공")
-                return self.cache[barcode]
+        cached = self.get_cached(barcode)
+        if cached is not None:
+            self.logger.info("바코드 %s 캐시에서 조회 성공", barcode)
+            return cached
 
         try:
             result = self.retry_handler.retry_sync(
+                self._run_with_driver,
                 self._process_single_barcode,
                 barcode
             )
 
             end_time = time.time()
             self.logger.info(
-                f"바코드 {barcode} 정보 조회 완료 "
-                f"(소요시간: {end_time - start_time:.2f}초)"
+                "바코드 %s 정보 조회 완료 (소요시간: %.2f초)",
+                barcode,
+                end_time - start_time
             )
 
-            with self.cache_lock:
-                self.cache[barcode] = result
+            # 일시적인 실패가 고정되지 않도록 성공한 결과만 캐시
+            if result.success:
+                self.set_cached(barcode, result)
 
             return result
 
         except Exception as e:
-            self.logger.error(f"바코드 {barcode} 정보 조회 중 예외 발생", exc_info=True)
-            return {
-                'barcode': barcode,
-                'success': False,
-                'message': f'오류 발생: {str(e)}'
-            }
+            # 재시도 후 실패는 예상 가능한 경우이므로 스택 트레이스는 DEBUG 레벨에서만 기록
+            self.logger.error(
+                "바코드 %s 정보 조회 중 예외 발생: %s",
+                barcode,
+                e,
+                exc_info=self.logger.isEnabledFor(logging.DEBUG)
+            )
+            return BarcodeResponse(
+                barcode=barcode,
+                success=False,
+                message=f'오류 발생: {str(e)}'
+            )
 
-    def _process_single_barcode(self, barcode: str) -> Dict[str, Any]:
-        self.driver.get(self.config.URLS['koreannet'])
+    def _run_with_driver(self, func, *args):
+        # 시도마다 드라이버를 새로 대여하여 손상된 세션이 교체된 뒤 재시도되도록 함
+        with self.pool.acquire() as driver:
+            return func(driver, *args)
 
-        search_box = self.find_element_safely(By.ID, 'searchText')
+    def _process_single_barcode(self, driver: webdriver.Chrome, barcode: str) -> BarcodeResponse:
+        driver.get(self.config.URLS['koreannet'])
+
+        search_box = self.find_element_safely(
+            driver,
+            self.config.SELECTORS['koreannet']['search_box']
+        )
         if not search_box:
             raise Exception("검색창을 찾을 수 없음")
 
         search_box.clear()
         search_box.send_keys(barcode)
 
-        search_button = self.find_element_safely(By.CLASS_NAME, 'submit')
-        if search_button:
-            search_button.click()
+        search_button = self.find_element_safely(
+            driver,
+            self.config.SELECTORS['koreannet']['search_button']
+        )
+        if not search_button:
+            raise Exception("검색 버튼을 찾을 수 없음")
 
-        time.sleep(self.config.LOAD_WAIT)
+        search_button.click()
+        # 검색 전 전체 상품 목록을 이 바코드의 결과로 읽지 않도록 페이지 전환을 확인
+        if not self.wait_for_page_change(driver, search_box):
+            raise Exception("검색 결과 페이지로 이동하지 않음")
 
-        product_link = self.find_element_safely(
-            By.XPATH,
-            self.config.XPATHS['koreannet']['product_link']
+        product_card = self.find_element_safely(
+            driver,
+            self.config.SELECTORS['koreannet']['product_card']
         )
+        product_link = self.find_child_element(
+            product_card,
+            self.config.SELECTORS['koreannet']['product_link']
+        ) if product_card else None
         if not product_link:
-            return {
-                'barcode': barcode,
-                'success': False,
-                'message': '검색 결과가 없습니다.'
-            }
+            return BarcodeResponse(
+                barcode=barcode,
+                success=False,
+                message='검색 결과가 없습니다.'
+            )
 
-        product_info = self._collect_basic_product_info(barcode)
+        product_info = self._collect_basic_product_info(driver, product_card, barcode)
 
         product_link.click()
-        time.sleep(self.config.LOAD_WAIT)
+        if not self.wait_for_page_change(driver, product_card):
+            raise Exception("상품 상세 페이지로 이동하지 않음")
 
-        report_number_element = self.find_element_safely(
-            By.XPATH,
-            self.config.XPATHS['koreannet']['report_number']
+        report_number_text = self.read_text_safely(
+            driver,
+            self.config.SELECTORS['koreannet']['report_number']
         )
 
-        if report_number_element:
-            report_number_text = report_number_element.text.strip()
+        if report_number_text is not None:
             report_numbers = self.extract_report_numbers(report_number_text)
 
-            safety_info = self.get_food_safety_info(report_numbers)
+            safety_info = self.get_food_safety_info(driver, report_numbers)
             expiry_info = safety_info.get('expiry_info') if safety_info['success'] else '정보 없음'
         else:
             report_number_text = "정보 없음"
@@ -304,77 +736,86 @@ class BarcodeInfoScraper:
             '소비기한': expiry_info
         })
 
-        return {
-            'barcode': barcode,
-            'success': True,
-            'product_info': product_info
-        }
-
-    def _collect_basic_product_info(self, barcode: str) -> Dict[str, str]:
-        product_name_element = self.find_element_safely(
-            By.XPATH,
-            self.config.XPATHS['koreannet']['product_name']
+        return BarcodeResponse(
+            barcode=barcode,
+            success=True,
+            product_info=ProductInfo(**product_info)
         )
-        manufacturer_element = self.find_element_safely(
-            By.XPATH,
-            self.config.XPATHS['koreannet']['manufacturer']
-        )
-        image_element = self.find_element_safely(
-            By.XPATH,
-            self.config.XPATHS['koreannet']['image']
+
+    def _collect_basic_product_info(
+        self,
+        driver: webdriver.Chrome,
+        product_card: Any,
+        barcode: str
+    ) -> Dict[str, str]:
+        selectors = self.config.SELECTORS['koreannet']
+        card_info = driver.execute_script(
+            _READ_PRODUCT_CARD_JS,
+            product_card,
+            selectors['product_name'],
+            selectors['manufacturer'],
+            selectors['image']
         )
 
         return {
-            '제품명': product_name_element.text.strip() if product_name_element else "정보 없음",
-            '카테고리': manufacturer_element.text.strip() if manufacturer_element else "정보 없음",
-            '이미지URL': image_element.get_attribute('src') if image_element else None,
+            '제품명': card_info['product_name'] if card_info['product_name'] is not None else "정보 없음",
+            '카테고리': card_info['manufacturer'] if card_info['manufacturer'] is not None else "정보 없음",
+            '이미지URL': card_info['image'],
             '바코드': barcode
         }
 
     def close(self):
-        if hasattr(self, 'driver') and self.driver:
-            try:
-                self.driver.quit()
-                self.logger.info('Chrome 드라이버 종료 성공')
-            except Exception as e:
-                self.logger.error(f'Chrome 드라이버 종료 중 오류 발생: {str(e)}', exc_info=True)
-
-class BarcodeRequest(BaseModel):
-    barcodes: List[str]
-
-class ProductInfo(BaseModel):
-    품목보고번호: str
-    제품명: str
-    카테고리: str
-    이미지URL: Optional[str]
-    바코드: str
-    소비기한: str
-
-class BarcodeResponse(BaseModel):
-    barcode: str
-    success: bool
-    product_info: Optional[ProductInfo] = None
-    message: Optional[str] = None
-    # scraper = None  # 이 줄을 삭제하세요
+        if hasattr(self, 'report_executor'):
+            self.report_executor.shutdown(wait=True)
+        if hasattr(self, 'pool') and self.pool:
+            self.pool.close()
+        if getattr(self, 'disk_cache', None) is not None:
+            self.disk_cache.close()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global scraper
-    logging.info("애플리케이션 시작: 스크래퍼 초기화")
-    scraper = BarcodeInfoScraper()
-    yield
-    logging.info("애플리케이션 종료: 스크래퍼 정리")
-    if scraper:
-        scraper.close()
-
-app = FastAPI(lifespan=lifespan)
-executor = ThreadPoolExecutor(max_workers=ScraperConfig.MAX_WORKERS)
+    global scraper, executor
+    log_listener = setup_logging()
+    try:
+        logging.info("애플리케이션 시작: 스크래퍼 초기화")
+        scraper = BarcodeInfoScraper()
+        # 드라이버 풀 크기만큼만 스레드를 두어 대여 대기로 스레드가 낭비되지 않도록 함
+        executor = ThreadPoolExecutor(
+            max_workers=ScraperConfig.MAX_WORKERS,
+            thread_name_prefix='scraper'
+        )
+        yield
+        logging.info("애플리케이션 종료: 스크래퍼 정리")
+        # 진행 중인 조회가 끝날 때까지 이벤트 루프를 막지 않도록 별도 스레드에서 종료 대기
+        await asyncio.to_thread(executor.shutdown, wait=True)
+        if scraper:
+            scraper.close()
+    except Exception:
+        logging.error("애플리케이션 시작/종료 중 오류 발생", exc_info=True)
+        raise
+    finally:
+        # 큐에 남은 로그(시작 실패 원인 포함)가 모두 기록되도록 리스너는 항상 정지
+        log_listener.stop()
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+executor: Optional[ThreadPoolExecutor] = None
+# 동시에 들어온 요청끼리 같은 바코드 조회를 공유하기 위한 진행 중 작업 목록
+inflight_lookups: Dict[str, asyncio.Future] = {}
+
+def get_product_info_shared(loop: asyncio.AbstractEventLoop, barcode: str) -> asyncio.Future:
+    future = inflight_lookups.get(barcode)
+    if future is None:
+        future = loop.run_in_executor(executor, scraper.get_product_info, barcode)
+        inflight_lookups[barcode] = future
+        future.add_done_callback(lambda _: inflight_lookups.pop(barcode, None))
+    # 한 요청이 취소되어도 같은 작업을 기다리는 다른 요청에는 영향이 없도록 보호
+    return asyncio.shield(future)
 
 @app.post("/api/v1/barcode", response_model=List[BarcodeResponse])
 async def get_barcode_info(request: BarcodeRequest):
     logger = logging.getLogger(__name__)
-    logger.info(f"바코드 조회 요청 받음 - 바코드 개수: {len(request.barcodes)}")
-    logger.debug(f"요청된 바코드 목록: {request.barcodes}")
+    logger.info("바코드 조회 요청 받음 - 바코드 개수: %d", len(request.barcodes))
+    logger.debug("요청된 바코드 목록: %s", request.barcodes)
 
     start_time = time.time()
 
@@ -383,40 +824,43 @@ async def get_barcode_info(request: BarcodeRequest):
         raise HTTPException(status_code=400, detail="바코드 목록이 비어있습니다")
 
     try:
+        # 중복 바코드는 한 번만 조회
+        unique_barcodes = list(dict.fromkeys(request.barcodes))
+
         # 비동기로 여러 바코드 처리
-        logger.debug(f"비동기 처리 시작 - 동시 처리 바코드 수: {len(request.barcodes)}")
+        logger.debug("비동기 처리 시작 - 동시 처리 바코드 수: %d", len(unique_barcodes))
+        loop = asyncio.get_running_loop()
         tasks = []
 
-        for barcode in request.barcodes:
-            logger.debug(f"바코드 {barcode} 처리 작업 생성")
-            tasks.append(
-                asyncio.get_event_loop().run_in_executor(
-                    executor,
-                    scraper.get_product_info,
-                    barcode
-                )
-            )
+        for barcode in unique_barcodes:
+            logger.debug("바코드 %s 처리 작업 생성", barcode)
+            tasks.append(get_product_info_shared(loop, barcode))
 
         results = await asyncio.gather(*tasks)
 
         end_time = time.time()
         processing_time = end_time - start_time
-        success_count = sum(1 for r in results if r['success'])
+        success_count = sum(1 for r in results if r.success)
 
         logger.info(
-            f"바코드 처리 완료 - 총 처리: {len(results)}, "
-            f"성공: {success_count}, "
-            f"실패: {len(results) - success_count}, "
-            f"처리 시간: {processing_time:.2f}초"
+            "바코드 처리 완료 - 총 처리: %d, 성공: %d, 실패: %d, 처리 시간: %.2f초",
+            len(results),
+            success_count,
+            len(results) - success_count,
+            processing_time
         )
 
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         for result in results:
-            if result['success']:
-                logger.debug(f"성공한 바코드 {result['barcode']} 처리 결과: {result['product_info']}")
+            if result.success:
+                if debug_enabled:
+                    logger.debug("성공한 바코드 %s 처리 결과: %s", result.barcode, result.product_info)
             else:
-                logger.warning(f"실패한 바코드 {result['barcode']} 오류 메시지: {result.get('message')}")
+                logger.warning("실패한 바코드 %s 오류 메시지: %s", result.barcode, result.message)
 
-        return results
+        # 워커에서 이미 검증된 모델이므로 Response를 직접 반환하여 response_model 재검증을 건너뜀
+        contents = {result.barcode: result.model_dump() for result in results}
+        return ORJSONResponse(content=[contents[barcode] for barcode in request.barcodes])
 
     except Exception as e:
         logger.error("바코드 처리 중 예외 발생", exc_info=True)
@@ -433,7 +877,7 @@ async def health_check():
             "scraper_status": "ready" if scraper else "not_initialized",
             "version": "1.0.0"
         }
-        logger.info(f"헬스 체크 응답: {response}")
+        logger.info("헬스 체크 응답: %s", response)
         return response
     except Exception as e:
         logger.error("헬스 체크 중 오류 발생", exc_info=True)